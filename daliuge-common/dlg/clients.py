@@ -108,6 +108,15 @@ class BaseDROPManagerClient(RestClient):
         logger.debug('Successfully read %d sessions from %s:%s', len(sessions), self.host, self.port)
         return sessions
 
+    def sessions_with_status(self):
+        """
+        Like `sessions`, but each session additionally carries its graph status
+        under the ``graph_status`` key, all obtained in a single request
+        """
+        sessions = self._get_json('/sessions?include=graph_status')
+        logger.debug('Successfully read %d sessions (with graph status) from %s:%s', len(sessions), self.host, self.port)
+        return sessions
+
     def session(self, sessionId):
         """
         Returns the details of sessions `sessionId`
@@ -49,6 +49,7 @@ def check_port(host, port, timeout=0, checking_open=True, return_socket=False):
         raise ValueError("If return_socket is True then checking_open must be True")
 
     start = time.time()
+    refused_delay = 0.01
     while True:
         try:
 
@@ -60,29 +61,19 @@ def check_port(host, port, timeout=0, checking_open=True, return_socket=False):
                 if thisTimeout <= 0:
                     return False
 
-            # Create the socket and try to connect, sending data if required
-            s = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-
-            if return_socket:
-                ret = s
-            else:
-                ret = True
-
-            # socket is closed always on error, conditionally otherwise
-            try:
-                s.settimeout(thisTimeout)
-                s.connect((host, port))
-                if not return_socket:
-                    s.close()
-            except socket.error:
-                s.close()
-                raise
+            # Try to connect; the socket is closed by create_connection on
+            # error, and conditionally by us otherwise
+            s = socket.create_connection((host, port), thisTimeout)
 
             # Success if we were checking for an open port!
             if checking_open:
-                return ret
+                if return_socket:
+                    return s
+                s.close()
+                return True
 
             # Otherwise keep trying until we find the socket closed
+            s.close()
             time.sleep(0.1)
             continue
 
@@ -114,7 +105,9 @@ def check_port(host, port, timeout=0, checking_open=True, return_socket=False):
                             return False
                         raise
 
-                time.sleep(0.1)
+                # Back off exponentially, but keep polling frequently enough
+                time.sleep(refused_delay)
+                refused_delay = min(refused_delay * 2, 0.5)
                 continue
 
             # Any other error should be raised
@@ -151,4 +144,4 @@ def write_to(host, port, data, timeout=None):
     """
     sock = connect_to(host, port, timeout=timeout)
     with contextlib.closing(sock):
-        sock.send(data)
\ No newline at end of file
+        sock.sendall(data)
\ No newline at end of file
@@ -105,11 +105,16 @@ class RestClient(object):
         self._conn = None
         self._resp = None
 
-    def _close(self):
+    def _close_connection(self):
         if self._resp:
             self._resp.close()
+            self._resp = None
         if self._conn:
             self._conn.close()
+            self._conn = None
+
+    def _close(self):
+        self._close_connection()
 
     __del__ = _close
     def __enter__(self):
@@ -167,6 +172,10 @@ class RestClient(object):
             headers['Transfer-Encoding'] = 'chunked'
             content = chunked(content)
 
+        # Our servers close connections after each response, so there is
+        # nothing to reuse; release the previous one instead of leaving it
+        # to the garbage collector
+        self._close_connection()
         self._conn = httplib.HTTPConnection(self.host, self.port)
         self._conn.request(method, url, content, headers)
         self._resp = self._conn.getresponse()
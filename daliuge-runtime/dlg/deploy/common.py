@@ -21,7 +21,6 @@
 #
 import json
 import logging
-import os
 import time
 
 from .. import droputils
@@ -38,29 +37,53 @@ class _StatusDumper(BaseDROPManagerClient):
 
     def __init__(self, *args, **kwargs):
         self.dump_path = kwargs.pop('dump_path')
+        self._dump_file = None
         super(_StatusDumper, self).__init__(*args, **kwargs)
 
-    def _dump_session_status(self, session_id):
+    def _close(self):
+        super(_StatusDumper, self)._close()
+        if self._dump_file:
+            self._dump_file.close()
+            self._dump_file = None
+
+    __del__ = _close
+
+    def _dump_session_status(self, session_id, graph_status=None):
+        if graph_status is None:
+            graph_status = self.graph_status(session_id)
         wgs = {
             'ssid': session_id,
-            'gs': self.graph_status(session_id),
+            'gs': graph_status,
             'ts': '%.3f' % time.time()
         }
-        with open(self.dump_path, 'a') as fs:
-            json.dump(wgs, fs)
-            fs.write(os.linesep)
+        # The dump file is kept open across polls, and flushed once per poll
+        if not self._dump_file:
+            self._dump_file = open(self.dump_path, 'a')
+        self._dump_file.write(json.dumps(wgs, separators=(',', ':')) + '\n')
 
     def sessions(self):
-        sessions = super(_StatusDumper, self).sessions()
+        # Graph statuses come along with the sessions in a single request;
+        # servers that don't support it leave them out, so fall back to
+        # querying them individually
+        sessions = self.sessions_with_status()
         for session in sessions:
-            self._dump_session_status(session['sessionId'])
+            self._dump_session_status(session['sessionId'], session.pop('graph_status', None))
+        if self._dump_file:
+            self._dump_file.flush()
         return sessions
 
     def session(self, session_id):
         session = super(_StatusDumper, self).session(session_id)
         self._dump_session_status(session_id)
+        self._dump_file.flush()
         return session
 
+    def session_status(self, session_id):
+        status = super(_StatusDumper, self).session_status(session_id)
+        self._dump_session_status(session_id)
+        self._dump_file.flush()
+        return status
+
 
 def _is_end_state(session_status):
     return session_status in (SessionStates.FINISHED, SessionStates.CANCELLED)
@@ -85,12 +108,17 @@ def _session_status(session):
     return x
 
 
+def _status_finished(status):
+    # Composite managers report (possibly nested) per-node dictionaries;
+    # walk them lazily, stopping at the first node still running
+    if isinstance(status, dict):
+        return all(_status_finished(s) for s in status.values())
+    return _is_end_state(status)
+
+
 def _session_finished(session):
-    session_status = _session_status(session)
-    logger.debug("Session status: %r", session_status)
-    if isinstance(session_status, int):
-        return _is_end_state(session_status)
-    return all(_is_end_state(s) for s in session_status)
+    logger.debug("Session status: %r", session['status'])
+    return _status_finished(session['status'])
 
 def monitor_sessions(session_id=None, poll_interval=10, host='127.0.0.1',
                      port=constants.ISLAND_DEFAULT_REST_PORT, timeout=60,
@@ -101,18 +129,20 @@ def monitor_sessions(session_id=None, poll_interval=10, host='127.0.0.1',
     all have finished executing.
     """
     client = _get_client(host, port, timeout, status_dump_path)
-    if session_id:
-        while True:
-            session = client.session(session_id)
-            if _session_finished(session):
-                return _session_status(session)
-            time.sleep(poll_interval)
-    else:
-        while True:
-            sessions = client.sessions()
-            if all(_session_finished(s) for s in sessions):
-                return {s['sessionId']: _session_status(s) for s in sessions}
-            time.sleep(poll_interval)
+    with client:
+        if session_id:
+            while True:
+                # Only the status is needed, not the full session graph
+                session = {'status': client.session_status(session_id)}
+                if _session_finished(session):
+                    return _session_status(session)
+                time.sleep(poll_interval)
+        else:
+            while True:
+                sessions = client.sessions()
+                if all(_session_finished(s) for s in sessions):
+                    return {s['sessionId']: _session_status(s) for s in sessions}
+                time.sleep(poll_interval)
 
 def submit(pg, host='127.0.0.1', port=constants.ISLAND_DEFAULT_REST_PORT,
            timeout=60, skip_deploy=False, session_id=None):
@@ -32,7 +32,7 @@ Current plan (as of 12-April-2016):
 
 import json
 import logging
-import multiprocessing
+import multiprocessing.pool
 import optparse
 import os
 import socket
@@ -56,7 +56,9 @@ DIM_WAIT_TIME = 60
 MM_WAIT_TIME = DIM_WAIT_TIME
 GRAPH_SUBMIT_WAIT_TIME = 10
 GRAPH_MONITOR_INTERVAL = 5
+MAX_CHECK_THREADS = 256
 VERBOSITY = '5'
+_VERBOSITY_FLAGS = ('-v', '-vv', '-vvv')
 logger = logging.getLogger('deploy.pawsey.cluster')
 apps = (
     None,
@@ -90,17 +92,20 @@ def check_hosts(ips, port, timeout=None, check_with_session=False, retry=1):
     """
 
     def check_and_add(ip):
-        ntries = retry
-        while ntries:
+        for attempt in range(1, retry + 1):
             if check_host(ip, port, timeout=timeout, check_with_session=check_with_session):
                 logger.info("Host %s:%d is running", ip, port)
                 return ip
-            logger.warning("Failed to contact host %s:%d", ip, port)
-            ntries -= 1
+            logger.warning("Failed to contact host %s:%d (attempt %d/%d)", ip, port, attempt, retry)
         return None
 
+    if not ips:
+        return []
+
+    # Check all hosts concurrently (up to a limit), so checking many hosts
+    # that are down takes about as long as checking a single one.
     # Don't return None values
-    tp = multiprocessing.pool.ThreadPool(min(50, len(ips)))
+    tp = multiprocessing.pool.ThreadPool(min(MAX_CHECK_THREADS, len(ips)))
     up = tp.map(check_and_add, ips)
     tp.close()
     tp.join()
@@ -108,7 +113,13 @@ def check_hosts(ips, port, timeout=None, check_with_session=False, retry=1):
     return [ip for ip in up if ip]
 
 def get_ip_via_ifconfig(iface_index):
-    out = subprocess.check_output('ifconfig')
+    try:
+        out = subprocess.check_output('ifconfig')
+    except OSError:
+        # ifconfig is not installed everywhere anymore; netifaces doesn't need
+        # to spawn a process, but might enumerate interfaces in another order
+        logger.warning('ifconfig not available, using netifaces instead')
+        return get_ip_via_netifaces(iface_index)
     ifaces_info = list(filter(None, out.split(b'\n\n')))
     logger.info('Found %d interfaces, getting %d', len(ifaces_info), iface_index)
     for line in ifaces_info[iface_index].splitlines():
@@ -120,14 +131,17 @@ def get_ip_via_ifconfig(iface_index):
 def get_ip_via_netifaces(iface_index):
     return utils.get_local_ip_addr()[iface_index][0]
 
+def _verbosity_flag(logv):
+    """Returns the -v flag for verbosity level `logv`, clamped to [1, 3]"""
+    return _VERBOSITY_FLAGS[max(1, min(3, logv)) - 1]
+
 def start_node_mgr(log_dir, my_ip, logv=1, max_threads=0, host=None, event_listeners=''):
     """
     Start node manager
     """
     logger.info("Starting node manager on host %s", my_ip)
     host = host or '0.0.0.0'
-    lv = 'v' * logv
-    args = ['-l', log_dir, '-%s' % lv, '-H', host, '-m', '1024', '-t',
+    args = ['-l', log_dir, _verbosity_flag(logv), '-H', host, '-m', '1024', '-t',
             str(max_threads), '--no-dlm',
             '--event-listeners', event_listeners]
     return cmdline.dlgNM(optparse.OptionParser(), args)
@@ -137,8 +151,11 @@ def start_dim(node_list, log_dir, origin_ip, logv=1):
     Start data island manager
     """
     logger.info("Starting island manager on host %s for node managers %r", origin_ip, node_list)
-    lv = 'v' * logv
-    args = ['-l', log_dir, '-%s' % lv, '-N', ','.join(node_list),
+    # Pass the node list via a file to keep the command line short on large
+    # clusters
+    node_list_file = os.path.join(log_dir, 'dim_nodes.txt')
+    cmdline.writeNodesFile(node_list, node_list_file)
+    args = ['-l', log_dir, _verbosity_flag(logv), '-N', '@' + node_list_file,
             '-H', '0.0.0.0', '-m', '2048']
     proc = tool.start_process('dim', args)
     logger.info('Island manager process started with pid %d', proc.pid)
@@ -150,9 +167,8 @@ def start_mm(node_list, log_dir, logv=1):
 
     node_list:  a list of node address that host DIMs
     """
-    lv = 'v' * logv
     parser = optparse.OptionParser()
-    args = ['-l', log_dir, '-N', ','.join(node_list), '-%s' % lv,
+    args = ['-l', log_dir, '-N', ','.join(node_list), _verbosity_flag(logv),
             '-H', '0.0.0.0', '-m', '2048']
     cmdline.dlgMM(parser, args)
 
@@ -179,7 +195,11 @@ def submit_and_monitor(pg, opts, port):
         dump_path = None
         if opts.dump:
             dump_path = os.path.join(opts.log_dir, 'status-monitoring.json')
-        session_id = common.submit(pg, host='127.0.0.1', port=port)
+        try:
+            session_id = common.submit(pg, host='127.0.0.1', port=port)
+        except:
+            logger.exception('Graph submission failed, not monitoring it')
+            return
         while True:
             try:
                 common.monitor_sessions(session_id, host='127.0.0.1', port=port,
@@ -187,7 +207,10 @@ def submit_and_monitor(pg, opts, port):
                 break
             except:
                 logger.exception('Monitoring failed, restarting it')
-    t = threading.Thread(target=_task)
+    # A daemon thread, so the process can still exit if the main thread
+    # fails while this one is waiting on an unresponsive manager
+    t = threading.Thread(target=_task, name='submit-and-monitor')
+    t.daemon = True
     t.start()
     return t
 
@@ -207,12 +230,28 @@ def start_proxy(dlg_host, dlg_port, monitor_host, monitor_port):
         logger.exception("DALiuGE proxy terminated unexpectedly")
         sys.exit(1)
 
-def modify_pg(pgt, modifier):
+def parse_pg_modifier(modifier):
+    """
+    Parses a PG modifier specification into a (func, args, kwargs) tuple
+    """
     parts = modifier.split(',')
     func = utils.get_symbol(parts[0])
-    args = list(filter(lambda x: '=' not in x, parts[1:]))
-    kwargs = dict(map(lambda x: x.split('='), filter(lambda x: '=' in x, parts[1:])))
-    return func(pgt, *args, **kwargs)
+    args = []
+    kwargs = {}
+    for part in parts[1:]:
+        if '=' in part:
+            name, value = part.split('=', 1)
+            kwargs[name] = value
+        else:
+            args.append(part)
+    return func, args, kwargs
+
+def parse_pg_modifiers(modifiers):
+    """
+    Parses a colon-separated list of PG modifier specifications, ignoring
+    empty ones
+    """
+    return [parse_pg_modifier(m) for m in modifiers.split(':') if m]
 
 def get_pg(opts, nms, dims):
     """Gets the Physical Graph that is eventually submitted to the cluster, if any"""
@@ -220,6 +259,9 @@ def get_pg(opts, nms, dims):
     if not opts.logical_graph and not opts.physical_graph:
         return
 
+    # Resolve the PG modifiers up front so invalid specifications fail early
+    modifiers = parse_pg_modifiers(opts.pg_modifiers)
+
     num_nms = len(nms)
     num_dims = len(dims)
     if opts.logical_graph:
@@ -235,18 +277,29 @@ def get_pg(opts, nms, dims):
             pgt = json.load(f)
 
     # modify the PG as necessary
-    for modifier in opts.pg_modifiers.split(':'):
-        modify_pg(pgt, modifier)
+    for func, args, kwargs in modifiers:
+        func(pgt, *args, **kwargs)
 
     # Check that which NMs are up and use only those form now on
     nms = check_hosts(nms, NODE_DEFAULT_REST_PORT,
                       check_with_session=opts.check_with_session,
                       timeout=MM_WAIT_TIME, retry=3)
     pg = pg_generator.resource_map(pgt, dims + nms, num_islands=num_dims)
+    # json.dumps uses the C encoder, json.dump doesn't
     with open(os.path.join(opts.log_dir, 'pg.json'), 'wt') as f:
-        json.dump(pg, f)
+        f.write(json.dumps(pg))
     return pg
 
+def _local_rank():
+    """
+    Returns the rank of this process among those started in the same host,
+    as set by common MPI launchers or SLURM, or 0 if it cannot be determined
+    """
+    for var in ('OMPI_COMM_WORLD_LOCAL_RANK', 'MPI_LOCALRANKID', 'SLURM_LOCALID'):
+        if var in os.environ:
+            return int(os.environ[var])
+    return 0
+
 def get_ip(opts):
     find_ip = get_ip_via_ifconfig if opts.use_ifconfig else get_ip_via_netifaces
     return find_ip(opts.interface)
@@ -335,6 +388,10 @@ def main():
     (options, _) = parser.parse_args()
 
     if options.check_interfaces:
+        # The interfaces are the same for all processes in a host, so only
+        # one of them needs to check (and spawn ifconfig)
+        if _local_rank() != 0:
+            sys.exit(0)
         try:
             print("From netifaces: %s" % get_ip_via_netifaces(options.interface))
         except:
@@ -365,7 +422,7 @@ def main():
     remote = get_remote(options)
 
     log_dir = "{0}/{1}".format(options.log_dir, remote.rank)
-    os.makedirs(log_dir)
+    utils.createDirIfMissing(log_dir)
     logfile = log_dir + "/start_dlg_cluster.log"
     FORMAT = "%(asctime)-15s [%(levelname)5.5s] [%(threadName)15.15s] %(name)s#%(funcName)s:%(lineno)s %(message)s"
     logging.basicConfig(filename=logfile, level=logging.DEBUG, format=FORMAT)
@@ -422,7 +479,7 @@ def main():
             remote.send_dim_nodes(pg)
 
             # 7. make sure all DIMs are up running
-            dim_ips_up = check_hosts(remote.dim_ips, ISLAND_DEFAULT_REST_PORT, timeout=MM_WAIT_TIME, retry=10)
+            dim_ips_up = check_hosts(remote.dim_ips, ISLAND_DEFAULT_REST_PORT, timeout=MM_WAIT_TIME)
             if len(dim_ips_up) < len(remote.dim_ips):
                 logger.warning("Not all DIMs were up and running: %d/%d", len(dim_ips_up), len(remote.dim_ips))
 
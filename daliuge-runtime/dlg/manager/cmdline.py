@@ -269,17 +269,35 @@ def dlgNM(parser, args):
 
     start(options, parser)
 
-def dlgCompositeManager(parser, args, dmType, acronym, dmPort, dmRestServer):
+def writeNodesFile(nodes, path):
     """
-    Common entry point for the dlgDIM and dlgMM command-line scripts. It
-    starts the corresponding CompositeManager and exposes it through a
-    REST interface.
+    Writes `nodes` into `path` in the format expected by the -N @<file> option
+    of the dlgDIM and dlgMM command-line scripts.
+    """
+    with open(path, 'wt') as f:
+        f.write('\n'.join(nodes))
+
+def parseNodes(nodes):
+    """
+    Parses the value of the -N option of the dlgDIM and dlgMM command-line
+    scripts, which is either a comma-separated list of nodes or @<file>, in
+    which case nodes are read from <file> (one per line, or comma-separated).
+    """
+    if nodes.startswith('@'):
+        with open(nodes[1:]) as f:
+            nodes = f.read().replace('\n', ',')
+    return [s.strip() for s in nodes.split(',') if s.strip()]
+
+def parseCompositeManagerOptions(parser, args, dmType, acronym, dmPort, dmRestServer):
+    """
+    Parses the command-line options of the dlgDIM and dlgMM command-line
+    scripts.
     """
 
     # Parse command-line and check options
     addCommonOptions(parser, dmPort)
     parser.add_option("-N", "--nodes", action="store", type="string",
-                      dest="nodes", help = "Comma-separated list of node names managed by this %s" % (acronym), default="")
+                      dest="nodes", help = "Comma-separated list of node names managed by this %s, or @<file> to read them (one per line) from <file>" % (acronym), default="")
     parser.add_option("-k", "--ssh-pkey-path", action="store", type="string",
                       dest="pkeyPath", help = "Path to the private SSH key to use when connecting to the nodes", default=None)
     parser.add_option("--dmCheckTimeout", action="store", type="int",
@@ -288,11 +306,19 @@ def dlgCompositeManager(parser, args, dmType, acronym, dmPort, dmRestServer):
 
     # Add DIM-specific options
     options.dmType = dmType
-    options.dmArgs = ([s for s in options.nodes.split(',') if s],)
+    options.dmArgs = (parseNodes(options.nodes),)
     options.dmKwargs = {'pkeyPath': options.pkeyPath, 'dmCheckTimeout': options.dmCheckTimeout}
     options.dmAcronym = acronym
     options.restType = dmRestServer
+    return options
 
+def dlgCompositeManager(parser, args, dmType, acronym, dmPort, dmRestServer):
+    """
+    Common entry point for the dlgDIM and dlgMM command-line scripts. It
+    starts the corresponding CompositeManager and exposes it through a
+    REST interface.
+    """
+    options = parseCompositeManagerOptions(parser, args, dmType, acronym, dmPort, dmRestServer)
     start(options, parser)
 
 def dlgDIM(parser, args):
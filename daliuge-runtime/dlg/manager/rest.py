@@ -158,15 +158,21 @@ class ManagerRestServer(RestServer):
         sessionId = newSession['sessionId']
         self.dm.createSession(sessionId)
 
-    def sessions(self):
+    def sessions(self, include=()):
         sessions = []
         for sessionId in self.dm.getSessionIds():
-            sessions.append({'sessionId':sessionId, 'status':self.dm.getSessionStatus(sessionId), 'size': self.dm.getGraphSize(sessionId)})
+            session = {'sessionId':sessionId, 'status':self.dm.getSessionStatus(sessionId), 'size': self.dm.getGraphSize(sessionId)}
+            if 'graph_status' in include:
+                session['graph_status'] = self.dm.getGraphStatus(sessionId)
+            sessions.append(session)
         return sessions
 
     @daliuge_aware
     def getSessions(self):
-        return self.sessions()
+        # Clients can ask for extra per-session information to be included
+        # in the listing to avoid further per-session round-trips
+        include = bottle.request.query.get('include', '').split(',')
+        return self.sessions(include=include)
 
     @daliuge_aware
     def getSessionInformation(self, sessionId):
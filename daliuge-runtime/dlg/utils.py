@@ -154,14 +154,24 @@ def to_externally_contactable_host(host, prefer_local=False):
     # All addresses were loopbacks! let's return the last one
     raise a
 
+_default_dlg_dir = None
+def _getDefaultDlgDir():
+    # The user's home directory doesn't change during the lifetime of the
+    # process, so it's looked up (possibly via the password database) only once
+    global _default_dlg_dir
+    if _default_dlg_dir is None:
+        _default_dlg_dir = os.path.join(os.path.expanduser("~"), ".dlg")
+    return _default_dlg_dir
+
 def getDlgDir():
     """
     Returns the root of the directory structure used by the DALiuGE framework at
     runtime.
     """
-    if 'DLG_ROOT' in os.environ:
+    try:
         return os.environ['DLG_ROOT']
-    return os.path.join(os.path.expanduser("~"), ".dlg")
+    except KeyError:
+        return _getDefaultDlgDir()
 
 def getDlgPidDir():
     """
@@ -183,6 +193,19 @@ def createDirIfMissing(path):
     """
     Creates the given directory if it doesn't exist
     """
+
+    # Most of the time the directory (or at least its parent) already exists,
+    # in which case a single mkdir call is enough
+    try:
+        os.mkdir(path)
+        return
+    except OSError as e:
+        if e.errno == errno.EEXIST:
+            return
+        if e.errno != errno.ENOENT:
+            raise
+
+    # Parent directories are missing too
     try:
         os.makedirs(path)
     except OSError as e:
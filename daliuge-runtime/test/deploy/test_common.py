@@ -19,6 +19,7 @@
 #    Foundation, Inc., 59 Temple Place, Suite 330, Boston,
 #    MA 02111-1307  USA
 #
+import json
 import os
 import tempfile
 import unittest
@@ -66,6 +67,26 @@ class CommonTestsBase(ManagerStarter):
                                         port=self.port, status_dump_path=dump_path)
         self.assert_session_finished(status)
         self.assertTrue(os.path.exists(dump_path))
+        with open(dump_path) as f:
+            dumps = [json.loads(line) for line in f]
+        self.assertTrue(dumps)
+        self.assertTrue(all(d['ssid'] == session_id for d in dumps))
+        os.remove(dump_path)
+
+    def test_dump_file_kept_open(self):
+        dump_path = tempfile.mktemp()
+        self._submit()
+        client = common._get_client('127.0.0.1', self.port, 60, dump_path)
+        with client:
+            client.sessions()
+            dump_file = client._dump_file
+            for _ in range(4):
+                client.sessions()
+                self.assertIs(dump_file, client._dump_file)
+                self.assertFalse(dump_file.closed)
+        self.assertTrue(dump_file.closed)
+        with open(dump_path) as f:
+            self.assertEqual(5, len(f.readlines()))
         os.remove(dump_path)
 
 class TestDeployCommonNM(CommonTestsBase, unittest.TestCase):
@@ -0,0 +1,64 @@
+#
+#    ICRAR - International Centre for Radio Astronomy Research
+#    (c) UWA - The University of Western Australia, 2020
+#    Copyright by UWA (in the framework of the ICRAR)
+#    All rights reserved
+#
+#    This library is free software; you can redistribute it and/or
+#    modify it under the terms of the GNU Lesser General Public
+#    License as published by the Free Software Foundation; either
+#    version 2.1 of the License, or (at your option) any later version.
+#
+#    This library is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+#    Lesser General Public License for more details.
+#
+#    You should have received a copy of the GNU Lesser General Public
+#    License along with this library; if not, write to the Free Software
+#    Foundation, Inc., 59 Temple Place, Suite 330, Boston,
+#    MA 02111-1307  USA
+#
+import optparse
+import os
+import shutil
+import tempfile
+import unittest
+
+from dlg.manager import cmdline
+from dlg.manager.composite_manager import DataIslandManager
+from dlg.manager.constants import ISLAND_DEFAULT_REST_PORT
+from dlg.manager.rest import CompositeManagerRestServer
+
+
+class TestCompositeManagerNodes(unittest.TestCase):
+
+    def setUp(self):
+        unittest.TestCase.setUp(self)
+        self.tmpdir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+        unittest.TestCase.tearDown(self)
+
+    def _dim_nodes(self, nodes):
+        options = cmdline.parseCompositeManagerOptions(optparse.OptionParser(),
+            ['-N', nodes], DataIslandManager, 'DIM', ISLAND_DEFAULT_REST_PORT,
+            CompositeManagerRestServer)
+        return options.dmArgs[0]
+
+    def test_nodes_list(self):
+        self.assertEqual(['a', 'b', 'c'], self._dim_nodes('a,b,,c'))
+
+    def test_nodes_file(self):
+        fname = os.path.join(self.tmpdir, 'nodes.txt')
+        with open(fname, 'wt') as f:
+            f.write('a\n\nb,c\n d \n\n')
+        self.assertEqual(['a', 'b', 'c', 'd'], self._dim_nodes('@' + fname))
+
+    def test_written_nodes_file(self):
+        # start_dim writes its node list with writeNodesFile
+        nodes = ['10.0.0.%d' % i for i in range(100)]
+        fname = os.path.join(self.tmpdir, 'dim_nodes.txt')
+        cmdline.writeNodesFile(nodes, fname)
+        self.assertEqual(nodes, self._dim_nodes('@' + fname))
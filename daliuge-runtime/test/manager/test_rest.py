@@ -114,3 +114,19 @@ class TestRest(unittest.TestCase):
         ex = cm.exception
         self.assertTrue(hostname in ex.args[0])
         self.assertTrue(isinstance(ex.args[0][hostname], InvalidGraphException))
+
+    def test_sessions_with_status(self):
+
+        sid = 'lala'
+        c = NodeManagerClient(hostname)
+        c.createSession(sid)
+        c.addGraphSpec(sid, [{'oid': 'a', 'type': 'plain', 'storage': Categories.MEMORY}])
+        c.deploySession(sid)
+
+        sessions = c.sessions_with_status()
+        self.assertEqual(1, len(sessions))
+        self.assertEqual(sid, sessions[0]['sessionId'])
+        self.assertEqual(c.graph_status(sid), sessions[0]['graph_status'])
+
+        # The plain listing doesn't include the graph status
+        self.assertNotIn('graph_status', c.sessions()[0])
@@ -192,4 +192,17 @@ class TestUtils(unittest.TestCase):
         if old:
             os.environ['DLG_ROOT'] = old
         else:
-            del os.environ['DLG_ROOT']
\ No newline at end of file
+            del os.environ['DLG_ROOT']
+
+    def test_get_dlg_root_default(self):
+
+        # Without DLG_ROOT it should be under the user's home directory,
+        # consistently across calls
+        old = os.environ.pop('DLG_ROOT', None)
+        try:
+            expected = os.path.join(os.path.expanduser("~"), ".dlg")
+            self.assertEqual(utils.getDlgDir(), expected)
+            self.assertEqual(utils.getDlgDir(), expected)
+        finally:
+            if old:
+                os.environ['DLG_ROOT'] = old
\ No newline at end of file
@@ -20,10 +20,10 @@
 #    MA 02111-1307  USA
 #
 
+import json
 import logging
-import os
 import six
-from zipfile import ZipFile
+from zipfile import ZipFile, ZipInfo, ZIP_DEFLATED, ZIP_STORED
 
 import cwlgen
 
@@ -33,7 +33,15 @@ from dlg.common import Categories
 # the following node categories are supported by the CWL translator
 SUPPORTED_CATEGORIES = [Categories.BASH_SHELL_APP, Categories.FILE]
 
-#from ..common import dropdict, get_roots
+# ZIP members smaller than this (in bytes) are stored instead of deflated,
+# since compressing them saves little to no space
+MIN_DEFLATED_SIZE = 200
+
+# fixed timestamp and permissions of ZIP members, so that translating the
+# same graph always yields the same archive
+ZIP_MEMBER_DATE_TIME = (1980, 1, 1, 0, 0, 0)
+ZIP_MEMBER_ATTRIBUTES = 0o644 << 16
+
 logger = logging.getLogger(__name__)
 
 
@@ -50,15 +58,8 @@ def create_workflow(drops, cwl_filename, buffer):
           Non-BashShellApp nodes are unable to be implemented in CWL
     """
 
-    # search the drops for non-BashShellApp drops,
-    # if found, the graph cannot be translated into CWL
-    for index, node in enumerate(drops):
-        dataType = node.get('dt', '')
-        if dataType not in SUPPORTED_CATEGORIES:
-            raise Exception('Node {0} has an unsupported category: {1}'.format(index, dataType))
-
-    # create list for command line tool description files
-    step_files = []
+    # create list of (filename, command line tool) pairs, serialised at the end
+    step_tools = []
 
     # create the workflow
     cwl_workflow = cwlgen.Workflow('', label='', doc='', cwl_version='v1.0')
@@ -66,57 +67,85 @@ def create_workflow(drops, cwl_filename, buffer):
     # create files dictionary
     files = {}
 
-    # look for input and output files in the pg_spec
-    for index, node in enumerate(drops):
-        command = node.get('command', None)
-        dataType = node.get('dt', None)
-        outputId = node.get('oid', None)
-        outputs = node.get('outputs', [])
+    # create list of (step, inputs) pairs; the inputs of a step can only be
+    # resolved once the outputs of all nodes in the pg_spec are known
+    step_inputs = []
 
-        if len(outputs) > 0:
-            files[outputs[0]] = "step" + str(index) + "/output_file_0"
+    # avoid repeated module attribute lookups in the loops below
+    WorkflowStep = cwlgen.WorkflowStep
+    WorkflowStepInput = cwlgen.WorkflowStepInput
+    WorkflowStepOutput = cwlgen.WorkflowStepOutput
+    add_step = cwl_workflow.steps.append
 
-    # add steps to the workflow
+    # single pass over the pg_spec: check that there are no non-BashShellApp
+    # drops (if found, the graph cannot be translated into CWL), look for
+    # output files and add steps to the workflow
     for index, node in enumerate(drops):
         dataType = node.get('dt', '')
+        if dataType not in SUPPORTED_CATEGORIES:
+            raise Exception('Node {0} has an unsupported category: {1}'.format(index, dataType))
+
+        if dataType != Categories.BASH_SHELL_APP:
+            continue
 
-        if dataType == 'BashShellApp':
-            name = node.get('nm', '')
-            inputs = node.get('inputs', [])
-            outputs = node.get('outputs', [])
+        inputs = node.get('inputs') or ()
+        outputs = node.get('outputs') or ()
 
-            # create command line tool description
-            filename = "step" + str(index) + ".cwl"
-            contents = create_command_line_tool(node)
+        # create command line tool description
+        step_id = 'step%d' % index
+        filename = step_id + '.cwl'
+        step_tools.append((filename, create_command_line_tool(node)))
 
-            # add contents of command line tool description to list of step files
-            step_files.append({"filename":filename, "contents": contents})
+        # create step
+        step = WorkflowStep(step_id, run=filename)
 
-            # create step
-            step = cwlgen.WorkflowStep("step" + str(index), run=filename)
+        # add output to step, and record where each output file comes from
+        for out_index, output in enumerate(outputs):
+            output_name = 'output_file_%d' % out_index
+            files[output] = '%s/%s' % (step_id, output_name)
+            step.out.append(WorkflowStepOutput(output_name))
 
-            # add input to step
-            for index, input in enumerate(inputs):
-                step.inputs.append(cwlgen.WorkflowStepInput('input_file_' + str(index), source=files[input]))
+        step_inputs.append((step, inputs))
 
-            # add output to step
-            for index, output in enumerate(outputs):
-                step.out.append(cwlgen.WorkflowStepOutput('output_file_' + str(index)))
+        # add step to workflow
+        add_step(step)
 
-            # add step to workflow
-            cwl_workflow.steps.append(step)
+    # add inputs to steps
+    for step, inputs in step_inputs:
+        for index, input in enumerate(inputs):
+            step.inputs.append(WorkflowStepInput('input_file_%d' % index, source=files[input]))
+
+    step_files = [(filename, _export(cwl_tool)) for filename, cwl_tool in step_tools]
+    logger.debug("Created CWL workflow with %d steps", len(step_files))
 
     # put workflow and command line tool description files all together in a zip
-    zipObj = ZipFile(buffer, 'w')
-    for step_file in step_files:
-        zipObj.writestr(step_file["filename"], six.b(step_file["contents"]))
-    zipObj.writestr(cwl_filename, six.b(cwl_workflow.export_string()))
-    zipObj.close()
+    # the archive is written in one go, and closed even if writing fails
+    with ZipFile(buffer, 'w', compression=ZIP_DEFLATED, allowZip64=True) as zipObj:
+        for filename, contents in step_files:
+            _write_zip_member(zipObj, filename, contents)
+        _write_zip_member(zipObj, cwl_filename, _export(cwl_workflow))
+
+
+def _write_zip_member(zipObj, filename, contents):
+    contents = six.b(contents)
+    zinfo = ZipInfo(filename, date_time=ZIP_MEMBER_DATE_TIME)
+    zinfo.external_attr = ZIP_MEMBER_ATTRIBUTES
+    zinfo.compress_type = ZIP_DEFLATED if len(contents) >= MIN_DEFLATED_SIZE else ZIP_STORED
+    zipObj.writestr(zinfo, contents)
+
+
+def _export(cwl_object):
+    """
+    Serialises a cwlgen workflow or command line tool. CWL documents can be
+    written in JSON (a subset of YAML), which is much faster to emit than
+    YAML; hence we don't use cwlgen's own YAML-based export_string() method.
+    """
+    return json.dumps(cwl_object.get_dict(), indent=2, sort_keys=True)
 
 
 def create_command_line_tool(node):
     """
-    Create a command line tool description file for a single step in a CWL
+    Create a command line tool description for a single step in a CWL
     workflow.
 
     NOTE: CWL only supports workflow steps that are bash shell applications
@@ -124,32 +153,40 @@ def create_command_line_tool(node):
     """
 
     # get inputs and outputs
-    inputs = node.get('inputs', [])
-    outputs = node.get('outputs', [])
+    inputs = node.get('inputs') or ()
+    outputs = node.get('outputs') or ()
 
     # strip command down to just the basic command, with no input or output parameters
-    base_command = node.get('command', '')
-
+    # (commands without parameters are used as they are)
     # TODO: find a better way of specifying command line program + arguments
-    base_command = base_command[:base_command.index(" ")]
-    base_command = common.u2s(base_command)
+    base_command = node.get('command', '').partition(' ')[0]
 
     # cwlgen's Serializer class doesn't support python 2.7's unicode types
-    cwl_tool = cwlgen.CommandLineTool(tool_id=common.u2s(node['app']), label=common.u2s(node['nm']), base_command=base_command, cwl_version='v1.0')
+    base_command = common.u2s(base_command)
+    tool_id = common.u2s(node['app'])
+    label = common.u2s(node['nm'])
+    cwl_tool = cwlgen.CommandLineTool(tool_id=tool_id, label=label, base_command=base_command, cwl_version='v1.0')
+
+    # avoid repeated module attribute lookups in the loops below
+    CommandLineBinding = cwlgen.CommandLineBinding
+    CommandInputParameter = cwlgen.CommandInputParameter
+    CommandOutputParameter = cwlgen.CommandOutputParameter
+    add_input = cwl_tool.inputs.append
+    add_output = cwl_tool.outputs.append
 
     # add inputs
     for index, input in enumerate(inputs):
-        file_binding = cwlgen.CommandLineBinding(position=index)
-        input_file = cwlgen.CommandInputParameter('input_file_' + str(index), param_type='File', input_binding=file_binding, doc='input file ' + str(index))
-        cwl_tool.inputs.append(input_file)
+        file_binding = CommandLineBinding(position=index)
+        input_file = CommandInputParameter('input_file_%d' % index, param_type='File', input_binding=file_binding, doc='input file %d' % index)
+        add_input(input_file)
 
-    if len(inputs) == 0:
-        cwl_tool.inputs.append(cwlgen.CommandInputParameter('dummy', param_type='null', doc='dummy'))
+    if not inputs:
+        add_input(CommandInputParameter('dummy', param_type='null', doc='dummy'))
 
     # add outputs
     for index, output in enumerate(outputs):
-        file_binding = cwlgen.CommandLineBinding()
-        output_file = cwlgen.CommandOutputParameter('output_file_' + str(index), param_type='stdout', output_binding=file_binding, doc='output file ' + str(index))
-        cwl_tool.outputs.append(output_file)
+        file_binding = CommandLineBinding()
+        output_file = CommandOutputParameter('output_file_%d' % index, param_type='stdout', output_binding=file_binding, doc='output file %d' % index)
+        add_output(output_file)
 
-    return cwl_tool.export_string()
+    return cwl_tool
@@ -2764,12 +2764,12 @@ def resource_map(pgt, nodes, num_islands=1):
         err_info = "Empty node_list, cannot map the PG template"
         raise ValueError(err_info)
 
-    dim_list = nodes[0:num_islands]
-    nm_list = nodes[num_islands:]
+    # Templates refer to nodes/islands as '#i' (see PGT.to_pg_spec), map
+    # those names directly instead of parsing them on each drop
+    dim_map = {"#%d" % i: n for i, n in enumerate(nodes[0:num_islands])}
+    nm_map = {"#%d" % i: n for i, n in enumerate(nodes[num_islands:])}
     for drop_spec in pgt:
-        nidx = int(drop_spec["node"][1:])  # skip '#'
-        drop_spec["node"] = nm_list[nidx]
-        iidx = int(drop_spec["island"][1:])  # skip '#'
-        drop_spec["island"] = dim_list[iidx]
+        drop_spec["node"] = nm_map[drop_spec["node"]]
+        drop_spec["island"] = dim_map[drop_spec["island"]]
 
     return pgt  # now it's a PG
@@ -0,0 +1,109 @@
+#
+#    ICRAR - International Centre for Radio Astronomy Research
+#    (c) UWA - The University of Western Australia, 2020
+#    Copyright by UWA (in the framework of the ICRAR)
+#    All rights reserved
+#
+#    This library is free software; you can redistribute it and/or
+#    modify it under the terms of the GNU Lesser General Public
+#    License as published by the Free Software Foundation; either
+#    version 2.1 of the License, or (at your option) any later version.
+#
+#    This library is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+#    Lesser General Public License for more details.
+#
+#    You should have received a copy of the GNU Lesser General Public
+#    License along with this library; if not, write to the Free Software
+#    Foundation, Inc., 59 Temple Place, Suite 330, Boston,
+#    MA 02111-1307  USA
+
+import io
+import json
+import unittest
+import zipfile
+
+from dlg.common import Categories
+from dlg.dropmake.cwl import create_workflow
+
+
+def _bash_app(oid, command, inputs=(), outputs=()):
+    return {'oid': oid, 'dt': Categories.BASH_SHELL_APP, 'nm': oid,
+            'app': 'dlg.apps.bash_shell_app.BashShellApp', 'command': command,
+            'inputs': list(inputs), 'outputs': list(outputs)}
+
+def _file(oid):
+    return {'oid': oid, 'dt': Categories.FILE, 'nm': oid}
+
+def _translate(drops):
+    """Translates `drops` and returns the contents of the resulting archive"""
+    buf = io.BytesIO()
+    create_workflow(drops, 'workflow.cwl', buf)
+    return buf.getvalue()
+
+def _members(archive):
+    """Returns a dictionary with the parsed contents of each archive member"""
+    with zipfile.ZipFile(io.BytesIO(archive)) as z:
+        return {name: json.loads(z.read(name).decode('utf-8')) for name in z.namelist()}
+
+
+class TestCWL(unittest.TestCase):
+
+    def test_consumer_before_producer(self):
+        # The consumer uses the second output of a producer listed after it
+        drops = [
+            _bash_app('consumer', 'cat', inputs=['o2']),
+            _file('o2'),
+            _bash_app('producer', 'echo hi', outputs=['o1', 'o2']),
+            _file('o1'),
+        ]
+        steps = _members(_translate(drops))['workflow.cwl']['steps']
+        self.assertEqual('step2/output_file_1', steps['step0']['in']['input_file_0']['source'])
+        self.assertEqual(['output_file_0', 'output_file_1'], steps['step2']['out'])
+
+    def test_command_without_arguments(self):
+        members = _members(_translate([_bash_app('a', 'ls')]))
+        self.assertEqual('step0.cwl', members['workflow.cwl']['steps']['step0']['run'])
+        self.assertEqual('ls', members['step0.cwl']['baseCommand'])
+
+    def test_workflow(self):
+        drops = [
+            _bash_app('a', 'echo hi', outputs=['f1', 'f2']),
+            _file('f1'),
+            _file('f2'),
+            _bash_app('b', 'cat -n', inputs=['f1', 'f2'], outputs=['f3']),
+            _file('f3'),
+        ]
+        archive = _translate(drops)
+
+        # Every member is a JSON document
+        members = _members(archive)
+        self.assertEqual({'step0.cwl', 'step3.cwl', 'workflow.cwl'}, set(members))
+
+        workflow = members['workflow.cwl']
+        self.assertEqual('Workflow', workflow['class'])
+        steps = workflow['steps']
+        self.assertEqual({'step0', 'step3'}, set(steps))
+        self.assertEqual('step0.cwl', steps['step0']['run'])
+        self.assertEqual({}, steps['step0']['in'])
+        self.assertEqual(['output_file_0', 'output_file_1'], steps['step0']['out'])
+        self.assertEqual('step3.cwl', steps['step3']['run'])
+        self.assertEqual(
+            {'input_file_0': {'id': 'input_file_0', 'source': 'step0/output_file_0'},
+             'input_file_1': {'id': 'input_file_1', 'source': 'step0/output_file_1'}},
+            steps['step3']['in'])
+        self.assertEqual(['output_file_0'], steps['step3']['out'])
+
+        tool = members['step3.cwl']
+        self.assertEqual('CommandLineTool', tool['class'])
+        self.assertEqual('cat', tool['baseCommand'])
+        self.assertEqual(['input_file_0', 'input_file_1'], [i['id'] for i in tool['inputs']])
+        self.assertEqual(['output_file_0'], [o['id'] for o in tool['outputs']])
+
+        # Archives are reproducible
+        self.assertEqual(archive, _translate(drops))
+        with zipfile.ZipFile(io.BytesIO(archive)) as z:
+            for info in z.infolist():
+                self.assertEqual((1980, 1, 1, 0, 0, 0), info.date_time)
+                self.assertEqual(0o644 << 16, info.external_attr)
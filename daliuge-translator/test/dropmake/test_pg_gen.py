@@ -166,6 +166,18 @@ class TestPGGen(unittest.TestCase):
             lg = LG(fp)
             lg.unroll_to_tpl()
 
+    def test_resource_map(self):
+        pgt = [
+            {'oid': 'a', 'node': '#0', 'island': '#0'},
+            {'oid': 'b', 'node': '#1', 'island': '#0'},
+            {'oid': 'c', 'node': '#2', 'island': '#1'},
+            {'oid': 'd', 'node': '#0', 'island': '#1'},
+        ]
+        nodes = ['dim0', 'dim1', 'nm0', 'nm1', 'nm2']
+        pg = pg_generator.resource_map(pgt, nodes, num_islands=2)
+        self.assertEqual([('nm0', 'dim0'), ('nm1', 'dim0'), ('nm2', 'dim1'), ('nm0', 'dim1')],
+                         [(d['node'], d['island']) for d in pg])
+
     def test_cwl_translate(self):
         import git
         import os